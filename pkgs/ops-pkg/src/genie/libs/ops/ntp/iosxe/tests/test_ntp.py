@@ -1,6 +1,5 @@
 # Python
 import unittest
-from copy import deepcopy
 from unittest.mock import Mock
 
 # ATS
@@ -28,6 +27,8 @@ def mapper(key):
 
 class test_ntp(unittest.TestCase):
 
+    maxDiff = None
+
     def setUp(self):
         self.device = Device(name='aDevice')
         self.device.os = 'iosxe'
@@ -38,7 +39,6 @@ class test_ntp(unittest.TestCase):
         self.device.connectionmgr.connections['cli'] = self.device
 
     def test_complete_output(self):
-        self.maxDiff = None
         ntp = Ntp(device=self.device)
         # Get outputs
         ntp.maker.outputs[ShowNtpAssociations] = \
@@ -64,7 +64,6 @@ class test_ntp(unittest.TestCase):
                                  ['10.64.4.4']['type']['server']['type'], 'server')
 
     def test_empty_output(self):
-        self.maxDiff = None
         ntp = Ntp(device=self.device)
         # Get outputs
         ntp.maker.outputs[ShowNtpAssociations] = \
@@ -84,8 +83,6 @@ class test_ntp(unittest.TestCase):
             ntp.info['clock_state']
 
     def test_incomplete_output(self):
-        self.maxDiff = None
-        
         ntp = Ntp(device=self.device)
 
         # Get outputs
@@ -111,6 +108,13 @@ class test_ntp(unittest.TestCase):
 class test_ntp_without_peer_configuration(unittest.TestCase):
     '''only has ntp default configured on device'''
 
+    maxDiff = None
+
+    @classmethod
+    def setUpClass(cls):
+        # Return outputs above as inputs to parser when called
+        cls._mock_execute = Mock(side_effect=mapper)
+
     def setUp(self):
         self.device = Device(name='aDevice')
         self.device.os = 'nxos'
@@ -119,14 +123,10 @@ class test_ntp_without_peer_configuration(unittest.TestCase):
         # Give the device as a connection type
         # This is done in order to call the parser on the output provided
         self.device.connectionmgr.connections['cli'] = self.device
+        self.device.execute = self._mock_execute
 
     def test_complete_output(self):
-        self.maxDiff = None
         ntp = Ntp(device=self.device)
-        
-        # Return outputs above as inputs to parser when called
-        self.device.execute = Mock()
-        self.device.execute.side_effect = mapper
 
         # Learn the feature
         ntp.learn()
@@ -2,6 +2,7 @@
 
 # Python
 import os
+import heapq
 import logging
 import re
 import time
@@ -12,17 +13,15 @@ from unicon.core.errors import SubCommandFailure
 
 # pyATS
 from ats.easypy import runtime
-from ats.utils.objects import find, R
 from pyats.datastructures.logic import Not
 
 # Genie
 from genie.utils.config import Config
-from genie.libs.parser.utils.common import Common
-from genie.libs.sdk.libs.utils.normalize import GroupKeys
 from genie.metaparser.util.exceptions import SchemaEmptyParserError
 
 # libs
 from genie.libs.sdk.apis.utils import (
+    _canon_intf,
     int_to_mask,
     get_config_dict,
     question_mark_retrieve,
@@ -35,6 +34,26 @@ from genie.libs.sdk.apis.iosxe.running_config.get import (
 
 log = logging.getLogger(__name__)
 
+# interface GigabitEthernet1 (sub-interfaces excluded)
+_SVC_POLICY_INTF_RE = re.compile(r"interface +(?P<intf>(?!\S+\.\S*)\S+)")
+# interface GigabitEthernet1.100
+_SVC_POLICY_INTF_VIRT_RE = re.compile(r"interface +(?P<intf>\S+)")
+# <68-1500>
+_MTU_RANGE_RE = re.compile(r"<(?P<min>\d+)-(?P<max>\d+)>")
+# ip address 192.168.10.254 255.255.255.0
+# Separators are restricted to blanks so a match never spans lines
+_IP_ADDR_MASK_RE = re.compile(
+    r"^[ \t]*ip[ \t]+address[ \t]+(?P<address>\S+)[ \t]+(?P<mask>\S+)",
+    re.M,
+)
+
+# Upper boundaries of ipv4 classes A, B and C with their classful prefix
+_IP_CLASS = (
+    ("/8", int(IPv4Address("127.0.0.0"))),
+    ("/16", int(IPv4Address("191.255.0.0"))),
+    ("/24", int(IPv4Address("223.255.255.0"))),
+)
+
 
 def get_neighbor_interface_and_device(device, interface_alias):
     """ Get neighbor interface and device from topology
@@ -66,12 +85,62 @@ def get_neighbor_interface_and_device(device, interface_alias):
         return None, None
 
 
-def get_interface_mtu_size(device, interface):
+def _get_show_interfaces_entry(output, interface):
+    """ Get interface entry from parsed 'show interfaces' output
+
+        Parser output is keyed by the full interface name, which can differ
+        from the name passed in (i.e. Gi1, gi1 / GigabitEthernet1)
+
+        Args:
+            output ('dict'): Parsed output of command 'show interfaces' or
+                             'show interfaces {interface}'
+            interface (`str`): Interface name
+        Returns:
+            None
+            interface dict
+    """
+    intf_dict = output.get(interface) or output.get(_canon_intf(interface))
+    if intf_dict is None and len(output) == 1:
+        # 'show interfaces {interface}' only holds the requested interface
+        intf_dict = next(iter(output.values()))
+
+    return intf_dict
+
+
+def _get_show_interfaces_field(device, interface, field, output=None):
+    """ Get a field of interface from 'show interfaces {interface}'
+
+        Args:
+            device (`obj`): Device object
+            interface (`str`): Interface name
+            field (`str`): Key under the interface in parsed output
+            output ('dict'): Optional. Parsed output of command
+                             'show interfaces {interface}'
+        Returns:
+            None
+            field value
+    """
+    if not output:
+        try:
+            output = device.parse(
+                "show interfaces {interface}".format(interface=interface)
+            )
+        except SchemaEmptyParserError:
+            return
+
+    intf_dict = _get_show_interfaces_entry(output, interface)
+    if intf_dict:
+        return intf_dict.get(field)
+
+
+def get_interface_mtu_size(device, interface, output=None):
     """ Get interface MTU
 
         Args:
             device (`obj`): Device object
             interface (`str`): Interface name
+            output ('dict'): Optional. Parsed output of command
+                             'show interfaces {interface}'
 
         Returns:
             None
@@ -80,14 +149,7 @@ def get_interface_mtu_size(device, interface):
         Raises:
             None
     """
-    try:
-        out = device.parse(
-            "show interfaces {interface}".format(interface=interface)
-        )
-    except SchemaEmptyParserError:
-        return
-
-    return out[interface]["mtu"]
+    return _get_show_interfaces_field(device, interface, "mtu", output)
 
 
 def get_interface_mtu_config_range(device, interface):
@@ -110,8 +172,7 @@ def get_interface_mtu_config_range(device, interface):
     cmd = "conf t\ninterface {interface}\nmtu ".format(interface=interface)
     out = question_mark_retrieve(device, cmd, state="config")
 
-    p = re.compile(r"<(?P<min>\d+)-(?P<max>\d+)>")
-    m = p.search(out)
+    m = _MTU_RANGE_RE.search(out)
     if m:
         range_dict.update({"range": m.group()})
         range_dict.update({"min": int(m.groupdict()["min"])})
@@ -121,12 +182,14 @@ def get_interface_mtu_config_range(device, interface):
         return
 
 
-def get_interface_mac_address(device, interface):
+def get_interface_mac_address(device, interface, output=None):
     """ Get interface mac address from device
 
         Args:
             device (`obj`): Device object
             interface(`str`): Interface name
+            output ('dict'): Optional. Parsed output of command
+                             'show interfaces {interface}'
 
         Returns:
             None
@@ -137,16 +200,13 @@ def get_interface_mac_address(device, interface):
     """
     log.info("Getting mac address for {} on {}".format(interface, device.name))
 
-    try:
-        out = device.parse("show interfaces {}".format(interface))
-    except SchemaEmptyParserError:
-        return
-
-    return out[interface]["mac_address"]
+    return _get_show_interfaces_field(
+        device, interface, "mac_address", output
+    )
 
 
 def get_interface_without_service_policy(
-    device, interface_type, virtual_interface=False
+    device, interface_type, virtual_interface=False, output=None
 ):
     """ Find a interface without service-policy
 
@@ -154,6 +214,9 @@ def get_interface_without_service_policy(
             device (`obj`): Device object
             interface_type (`str`): Interface type
             virtual_interface ('bool'): flag for matching virtual interfaces
+            output ('dict'): Optional. Interface section of running-config
+                             from get_running_config_section_dict, reused
+                             instead of fetching it from the device
 
         Returns:
             None
@@ -163,19 +226,18 @@ def get_interface_without_service_policy(
             None
     """
     if not virtual_interface:
-        p = re.compile(r"interface +(?P<intf>(?!\S+\.\S*)\S+)")
+        p = _SVC_POLICY_INTF_RE
     else:
-        p = re.compile(r"interface +(?P<intf>\S+)")
+        p = _SVC_POLICY_INTF_VIRT_RE
 
-    config_dict = get_running_config_section_dict(
-        device, "interface"
-    )
-    for intf, config in config_dict.items():
+    if not output:
+        output = get_running_config_section_dict(device, "interface")
+
+    for intf, config in output.items():
         if intf.startswith("interface " + interface_type):
-            cfg = "\n".join(config)
-            if "service-policy" not in cfg:
+            if not any("service-policy" in line for line in config):
                 try:
-                    return p.search(intf).groupdict()["intf"]
+                    return p.match(intf).groupdict()["intf"]
                 except AttributeError:
                     continue
     else:
@@ -206,24 +268,10 @@ def get_interface_qlimit_bytes(device, interface):
     except SchemaEmptyParserError:
         return
 
-    reqs = R(
-        [
-            interface,
-            "index",
-            "(?P<index>.*)",
-            "software_control_info",
-            "qlimit_bytes",
-            "(?P<qlimit>.*)",
-        ]
-    )
-    found = find([out], reqs, filter_=False, all_keys=True)
-    if found:
-        keys = GroupKeys.group_keys(
-            reqs=reqs.args, ret_num={}, source=found, all_keys=True
-        )
-        return keys[0]["qlimit"]
-    else:
-        return
+    for data in out.get(interface, {}).get("index", {}).values():
+        qlimit = data.get("software_control_info", {}).get("qlimit_bytes")
+        if qlimit is not None:
+            return qlimit
 
 
 def get_interface_ip_address(device, interface):
@@ -250,16 +298,15 @@ def get_interface_ip_address(device, interface):
     except SchemaEmptyParserError as e:
         return
 
-    address = out["interface"].get(interface, {}).get("ip_address", None)
-    if interface not in out["interface"]:
+    intf_map = out["interface"]
+    if interface not in intf_map:
         return
-    elif (
-        "ip_address" not in out["interface"][interface]
-        or address == "unassigned"
-    ):
+
+    address = intf_map[interface].get("ip_address")
+    if not address or address == "unassigned":
         return
 
-    return out["interface"][interface]["ip_address"]
+    return address
 
 
 def get_interface_loopback_ip_address(device, num=1):
@@ -280,16 +327,17 @@ def get_interface_loopback_ip_address(device, num=1):
     except SchemaEmptyParserError:
         return []
 
-    count = 0
-    ip_addresses = []
-    for intf in sorted(out["interface"].keys()):
-        if "Loopback" in intf:
-            count += 1
-            ip_addresses.append((intf, out["interface"][intf]["ip_address"]))
-            if count == num:
-                break
+    loopbacks = [intf for intf in out["interface"] if "Loopback" in intf]
+
+    # Only the first num loopbacks are needed, no need to sort them all
+    if num > 0:
+        loopbacks = heapq.nsmallest(num, loopbacks)
+    else:
+        loopbacks.sort()
 
-    return ip_addresses
+    return [
+        (intf, out["interface"][intf]["ip_address"]) for intf in loopbacks
+    ]
 
 
 def get_unused_loopback_interface(device):
@@ -309,12 +357,19 @@ def get_unused_loopback_interface(device):
     except SchemaEmptyParserError:
         return "Loopback0"
 
-    if out:
-        # Get last used loopback address
-        loopback = sorted(out["interface"].keys())[-1]
+    # Get highest used loopback number
+    last = -1
+    for intf in out.get("interface", {}):
+        if intf.startswith("Loopback"):
+            try:
+                number = int(intf[len("Loopback") :])
+            except ValueError:
+                continue
+            if number > last:
+                last = number
 
-        # get loopback number and increment by 1
-        return "Loopback{}".format(int(loopback[len("Loopback") :]) + 1)
+    # get loopback number and increment by 1
+    return "Loopback{}".format(last + 1)
 
 
 def get_interface_with_mask(device, netmask="30", address_family="ipv4"):
@@ -337,15 +392,12 @@ def get_interface_with_mask(device, netmask="30", address_family="ipv4"):
     except SchemaEmptyParserError:
         return None, None
 
-    for intf in out:
-        if address_family in out[intf]:
-            for ip in out[intf][address_family]:
-                if out[intf][address_family][ip]["prefix_length"] == str(
-                    netmask
-                ):
-                    ip_address = out[intf][address_family][ip]["ip"]
-                    interface = intf
-                    return interface, ip_address
+    netmask = str(netmask)
+
+    for intf, intf_data in out.items():
+        for ip_data in intf_data.get(address_family, {}).values():
+            if ip_data["prefix_length"] == netmask:
+                return intf, ip_data["ip"]
 
     return None, None
 
@@ -383,13 +435,15 @@ def get_interface_with_up_state(
                 return interface
 
 
-def get_interface_carrier_delay(device, interface, delay_type):
+def get_interface_carrier_delay(device, interface, delay_type, output=None):
     """ Get interface carrier delay
 
         Args:
             device ('obj'): Device object
             interface ('str'): Interface name
             delay_type ('str'): Carrier delay type: 'up', 'down'
+            output ('dict'): Optional. Parsed output of command
+                             'show interfaces {interface}'
 
         Returns:
             None
@@ -398,18 +452,20 @@ def get_interface_carrier_delay(device, interface, delay_type):
         Raises:
             None
     """
-    try:
-        out = device.parse("show interfaces {intf}".format(intf=interface))
-    except SchemaEmptyParserError:
-        return
+    if not output:
+        try:
+            output = device.parse(
+                "show interfaces {intf}".format(intf=interface)
+            )
+        except SchemaEmptyParserError:
+            return
 
-    intf_dict = out[interface]
-    key = "carrier_delay_" + delay_type
-    if key in intf_dict:
-        return intf_dict[key]
+    intf_dict = _get_show_interfaces_entry(output, interface)
+    if intf_dict:
+        return intf_dict.get("carrier_delay_" + delay_type)
 
 
-def get_interface_ip_and_mask(device, interface, prefix=False):
+def get_interface_ip_and_mask(device, interface, prefix=False, output=None):
     """ Get interface ip address and mask
 
         Args:
@@ -417,6 +473,8 @@ def get_interface_ip_and_mask(device, interface, prefix=False):
             interface (`str`): Interface name
             prefix (`bool`): return ip with prefix if True
                              otherwise return ip and mask
+            output ('dict'): Optional. Parsed output of command
+                             'show interfaces {interface}'
 
         Returns:
             Tuple: (None, None)
@@ -425,21 +483,19 @@ def get_interface_ip_and_mask(device, interface, prefix=False):
         Raises:
             None
     """
-    ip = mask = None
-    try:
-        out = device.parse("show interfaces {}".format(interface))
-    except SchemaEmptyParserError:
+    if not output:
+        try:
+            output = device.parse("show interfaces {}".format(interface))
+        except SchemaEmptyParserError:
+            return None, None
+
+    interface_data = _get_show_interfaces_entry(output, interface)
+    if not interface_data or not interface_data.get("ipv4"):
         return None, None
 
-    for interface, interface_data in out.items():
-        if "ipv4" in interface_data.keys():
-            for ipv4, ip_data in interface_data["ipv4"].items():
-                if prefix:
-                    ip = ipv4
-                else:
-                    ip = ip_data["ip"]
-                mask = int_to_mask(ip_data["prefix_length"])
-                break
+    ipv4, ip_data = next(iter(interface_data["ipv4"].items()))
+    ip = ipv4 if prefix else ip_data["ip"]
+    mask = int_to_mask(ip_data["prefix_length"])
 
     return ip, mask
 
@@ -468,11 +524,10 @@ def get_interface_interfaces(device, link_name=None, opposite=False, num=0):
         intf_list = device.find_interfaces()
 
     if intf_list:
-        intf_list.sort()
-
         if num > 0 and num <= len(intf_list):
-            return intf_list[num - 1]
+            return heapq.nsmallest(num, intf_list)[-1]
 
+        intf_list.sort()
         return intf_list
     else:
         return {}
@@ -523,7 +578,7 @@ def get_interface_running_config(device, interface):
             None
     """
 
-    interface = Common.convert_intf_name(interface)
+    interface = _canon_intf(interface)
 
     try:
         output = device.execute(
@@ -586,7 +641,10 @@ def get_neighboring_device_interface(device, testbed, interface):
     )
 
     topology_devices = {}
-    link = testbed.find_links().pop()
+    link = next(iter(testbed.find_links()), None)
+    if link is None:
+        return {}
+
     for it in link.find_interfaces():
         if it.device == device:
             uplink_var = "uplink1"
@@ -654,19 +712,17 @@ def get_bundled_interface(device, port_channel, exclude_interface=None):
     """
     out = device.parse("show etherchannel summary")
 
-    if (
-        out
-        and "interfaces" in out
-        and port_channel.capitalize() in out["interfaces"]
-        and "members" in out["interfaces"][port_channel.capitalize()]
-    ):
-        for intf in out["interfaces"][port_channel.capitalize()]["members"]:
-            if out["interfaces"][port_channel.capitalize()]["members"][intf][
-                "bundled"
-            ]:
-                if exclude_interface and intf == exclude_interface:
-                    continue
-                return intf
+    members = (
+        out.get("interfaces", {})
+        .get(port_channel.capitalize(), {})
+        .get("members", {})
+    )
+
+    for intf, intf_data in members.items():
+        if intf_data["bundled"]:
+            if exclude_interface and intf == exclude_interface:
+                continue
+            return intf
 
 
 def get_interface_address_mask_running_config(device, interface):
@@ -682,10 +738,7 @@ def get_interface_address_mask_running_config(device, interface):
             None
     """
 
-    # ip address 192.168.10.254 255.255.255.0
-    r1 = re.compile(r"ip\s+address\s+(?P<address>\S+)\s+(?P<mask>\S+)")
-
-    interface = Common.convert_intf_name(interface)
+    interface = _canon_intf(interface)
 
     try:
         output = device.execute(
@@ -699,15 +752,12 @@ def get_interface_address_mask_running_config(device, interface):
     if not output:
         return None, None
 
-    for line in output.splitlines():
-        line = line.strip()
-
-        result = r1.match(line)
-        if result:
-            group = result.groupdict()
-            ip_address = group["address"]
-            mask = group["mask"]
-            return ip_address, mask
+    result = _IP_ADDR_MASK_RE.search(output)
+    if result:
+        group = result.groupdict()
+        ip_address = group["address"]
+        mask = group["mask"]
+        return ip_address, mask
 
 
 def get_interface_packet_output_rate(device, interface, seconds=60):
@@ -728,31 +778,14 @@ def get_interface_packet_output_rate(device, interface, seconds=60):
     if seconds <= 0:
         return
 
-    try:
-
-        output_before = device.execute(
-            "show interfaces {intf}".format(intf=interface)
-        )
-
-        log.info("Waiting {secs} seconds".format(secs=seconds))
-        time.sleep(seconds)
+    cmd = "show interfaces {intf}".format(intf=interface)
 
-        output_after = device.execute(
-            "show interfaces {intf}".format(intf=interface)
-        )
+    try:
 
-        parsed_output_before = device.parse(
-            "show interfaces {intf}".format(intf=interface),
-            output=output_before,
-        )
-        parsed_output_after = device.parse(
-            "show interfaces {intf}".format(intf=interface),
-            output=output_after,
-        )
-
-        delta_time = get_delta_time_from_outputs(
-            output_before=output_before, output_after=output_after
-        )
+        # Raw output is kept since the delta time is taken from the
+        # 'Time source' line, which is not part of the parsed output
+        output_before = device.execute(cmd)
+        parsed_output_before = device.parse(cmd, output=output_before)
 
         counter_before = get_interface_packet_counter(
             device=device,
@@ -763,6 +796,12 @@ def get_interface_packet_output_rate(device, interface, seconds=60):
         if not counter_before:
             return
 
+        log.info("Waiting {secs} seconds".format(secs=seconds))
+        time.sleep(seconds)
+
+        output_after = device.execute(cmd)
+        parsed_output_after = device.parse(cmd, output=output_after)
+
         counter_after = get_interface_packet_counter(
             device=device,
             interface=interface,
@@ -772,6 +811,10 @@ def get_interface_packet_output_rate(device, interface, seconds=60):
         if not counter_after:
             return
 
+        delta_time = get_delta_time_from_outputs(
+            output_before=output_before, output_after=output_after
+        )
+
         output_rate = round((counter_after - counter_before) / delta_time, 2)
 
     except SchemaEmptyParserError as e:
@@ -825,23 +868,21 @@ def get_interface_netmask(ip_address):
             None
     """
 
-    class_a = IPv4Address("127.0.0.0")
-    class_b = IPv4Address("191.255.0.0")
-    class_c = IPv4Address("223.255.255.0")
-    ip_addr = IPv4Address(ip_address)
-    ip_class = [("/8", class_a), ("/16", class_b), ("/24", class_c)]
+    ip_addr = int(IPv4Address(ip_address))
 
-    for e in ip_class:
-        if ip_addr < e[1]:
-            return e[0]
+    for prefix, boundary in _IP_CLASS:
+        if ip_addr < boundary:
+            return prefix
 
 
-def get_interface_port_channel_members(device, interface):
+def get_interface_port_channel_members(device, interface, output=None):
     """ Get interface members
 
         Args:
             device ('obj'): Device object
             interface ('str'): interface to search member for
+            output ('dict'): Optional. Parsed output of command
+                             'show interfaces {interface}'
 
         Returns:
             interface members
@@ -849,12 +890,14 @@ def get_interface_port_channel_members(device, interface):
         Raises:
             None
     """
-    try:
-        out = device.parse("show interfaces {}".format(interface))
-    except SchemaEmptyParserError:
-        return
+    if not output:
+        try:
+            output = device.parse("show interfaces {}".format(interface))
+        except SchemaEmptyParserError:
+            return
 
-    try:
-        return out[interface]["port_channel"]["port_channel_member_intfs"]
-    except KeyError:
-        return
+    intf_dict = _get_show_interfaces_entry(output, interface)
+    if intf_dict:
+        return intf_dict.get("port_channel", {}).get(
+            "port_channel_member_intfs"
+        )
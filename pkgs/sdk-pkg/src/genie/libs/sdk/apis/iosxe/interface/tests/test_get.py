@@ -0,0 +1,161 @@
+# Python
+import unittest
+from unittest.mock import Mock
+
+# Genie
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+from genie.libs.sdk.apis.iosxe.interface.get import (
+    get_interface_ip_and_mask,
+    get_interface_loopback_ip_address,
+    get_interface_mac_address,
+    get_interface_mtu_size,
+    get_neighboring_device_interface,
+    get_unused_loopback_interface,
+)
+
+# Parsed 'show interfaces GigabitEthernet1'
+show_interfaces_gi1 = {
+    'GigabitEthernet1': {
+        'mtu': 1500,
+        'mac_address': '5254.0072.9b0c',
+        'ipv4': {
+            '10.1.1.1/24': {'ip': '10.1.1.1', 'prefix_length': '24'}
+        },
+    }
+}
+
+# Parsed 'show interfaces'
+show_interfaces = {
+    'GigabitEthernet2': {
+        'ipv4': {
+            '10.2.2.2/30': {'ip': '10.2.2.2', 'prefix_length': '30'}
+        },
+    },
+}
+show_interfaces.update(show_interfaces_gi1)
+
+# Parsed 'show ip interface brief | include Loopback'
+show_ip_interface_brief_loopback = {
+    'interface': {
+        'Loopback9': {'ip_address': '10.9.9.9'},
+        'Loopback10': {'ip_address': '10.10.10.10'},
+        'Loopback2': {'ip_address': '10.2.2.2'},
+    }
+}
+
+
+def device_parsing(output):
+    device = Mock()
+    device.name = 'aDevice'
+    device.parse = Mock(return_value=output)
+    return device
+
+
+class test_get_interface_ip_and_mask(unittest.TestCase):
+
+    def test_full_name(self):
+        device = device_parsing(show_interfaces_gi1)
+        self.assertEqual(
+            get_interface_ip_and_mask(device, 'GigabitEthernet1'),
+            ('10.1.1.1', '255.255.255.0'))
+
+    def test_abbreviated_name(self):
+        device = device_parsing(show_interfaces_gi1)
+        self.assertEqual(get_interface_ip_and_mask(device, 'Gi1'),
+                         ('10.1.1.1', '255.255.255.0'))
+
+    def test_lowercase_name(self):
+        device = device_parsing(show_interfaces_gi1)
+        self.assertEqual(get_interface_ip_and_mask(device, 'gi1'),
+                         ('10.1.1.1', '255.255.255.0'))
+
+    def test_prefix(self):
+        device = device_parsing(show_interfaces_gi1)
+        self.assertEqual(
+            get_interface_ip_and_mask(device, 'Gi1', prefix=True),
+            ('10.1.1.1/24', '255.255.255.0'))
+
+    def test_shared_output_abbreviated_name(self):
+        device = device_parsing(None)
+        self.assertEqual(
+            get_interface_ip_and_mask(device, 'Gi1', output=show_interfaces),
+            ('10.1.1.1', '255.255.255.0'))
+        device.parse.assert_not_called()
+
+    def test_shared_output_unknown_interface(self):
+        device = device_parsing(None)
+        self.assertEqual(
+            get_interface_ip_and_mask(device, 'Gi3', output=show_interfaces),
+            (None, None))
+
+
+class test_get_interface_mtu_mac(unittest.TestCase):
+
+    def test_abbreviated_name(self):
+        device = device_parsing(show_interfaces_gi1)
+        self.assertEqual(get_interface_mtu_size(device, 'Gi1'), 1500)
+        self.assertEqual(get_interface_mac_address(device, 'Gi1'),
+                         '5254.0072.9b0c')
+
+    def test_unknown_interface(self):
+        device = device_parsing(None)
+        self.assertIsNone(
+            get_interface_mtu_size(device, 'Gi3', output=show_interfaces))
+        self.assertIsNone(
+            get_interface_mac_address(device, 'Gi3', output=show_interfaces))
+
+    def test_missing_field(self):
+        device = device_parsing(None)
+        self.assertIsNone(get_interface_mtu_size(
+            device, 'GigabitEthernet2', output=show_interfaces))
+
+
+class test_get_unused_loopback_interface(unittest.TestCase):
+
+    def test_numeric_order(self):
+        device = device_parsing(show_ip_interface_brief_loopback)
+        self.assertEqual(get_unused_loopback_interface(device), 'Loopback11')
+
+    def test_empty_output(self):
+        device = device_parsing({})
+        self.assertEqual(get_unused_loopback_interface(device), 'Loopback0')
+
+        device.parse.side_effect = SchemaEmptyParserError('empty')
+        self.assertEqual(get_unused_loopback_interface(device), 'Loopback0')
+
+
+class test_get_interface_loopback_ip_address(unittest.TestCase):
+
+    def setUp(self):
+        self.device = device_parsing(show_ip_interface_brief_loopback)
+
+    def test_num_zero_returns_all(self):
+        self.assertEqual(
+            get_interface_loopback_ip_address(self.device, num=0),
+            [('Loopback10', '10.10.10.10'),
+             ('Loopback2', '10.2.2.2'),
+             ('Loopback9', '10.9.9.9')])
+
+    def test_num_one(self):
+        self.assertEqual(
+            get_interface_loopback_ip_address(self.device, num=1),
+            [('Loopback10', '10.10.10.10')])
+
+    def test_num_above_count(self):
+        self.assertEqual(
+            get_interface_loopback_ip_address(self.device, num=5),
+            get_interface_loopback_ip_address(self.device, num=0))
+
+
+class test_get_neighboring_device_interface(unittest.TestCase):
+
+    def test_no_links(self):
+        device = device_parsing(None)
+        testbed = Mock()
+        testbed.find_links = Mock(return_value=[])
+        self.assertEqual(
+            get_neighboring_device_interface(device, testbed, 'Gi1'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,13 @@
 """Common get info functions for mpls"""
 
 # Python
-import re
 import logging
 
 # Genie
-from genie.libs.parser.utils.common import Common
 from genie.metaparser.util.exceptions import SchemaEmptyParserError
 
 # Utils
+from genie.libs.sdk.apis.utils import _canon_intf
 from genie.libs.sdk.apis.iosxe.running_config.get import (
     get_running_config_section_dict,
 )
@@ -16,58 +15,65 @@ from genie.libs.sdk.apis.iosxe.running_config.get import (
 log = logging.getLogger(__name__)
 
 
-def get_interface_interfaces_ldp_enabled(device, vrf=""):
+def get_interface_interfaces_ldp_enabled(device, vrf="", output=None):
     """ Get interfaces which have ldp configured from 'show mpls interfaces details'
+        For several vrfs, parse the command once and pass it as output
 
         Args:
             device ('str'): Device str
             vrf ('str'): Vrf name
+            output ('dict'): Optional. Parsed output of command
+                             'show mpls interfaces detail'
         Returns:
             interface list
         Raises:
             None
     """
-    try:
-        out = device.parse("show mpls interfaces detail")
-    except SchemaEmptyParserError:
-        return []
-
-    vrf = vrf if vrf else "default"
-
-    try:
-        keys = out["vrf"][vrf]["interfaces"].keys()
-    except KeyError:
+    if not output:
+        try:
+            output = device.parse("show mpls interfaces detail")
+        except SchemaEmptyParserError:
+            return []
+
+    interfaces = (
+        output.get("vrf", {}).get(vrf or "default", {}).get("interfaces")
+    )
+    if not interfaces:
         return []
 
-    return [Common.convert_intf_name(intf) for intf in keys]
+    return [_canon_intf(intf) for intf in interfaces]
 
 
-def get_mpls_interface_ldp_configured(device):
+def get_mpls_interface_ldp_configured(device, output=None):
     """ Get interfaces which have ldp configured from 'show run'
 
         Args:
             device ('obj'): Device object
+            output ('dict'): Optional. Interface section of running-config
+                             from get_running_config_section_dict, reused
+                             instead of fetching it from the device
         Returns:
             interface address
     """
-    interfaces = []
-    intf_dict = get_running_config_section_dict(
-        device, "interface"
-    )
+    if not output:
+        output = get_running_config_section_dict(device, "interface")
 
-    p = re.compile(r"^interface +(?P<name>[\S\s]+)$")
-    for intf, data_dict in intf_dict.items():
-        if "mpls label protocol ldp" in data_dict:
-            m = p.match(intf)
-            interfaces.append(m.groupdict()["name"])
-    return interfaces
+    # interface GigabitEthernet1
+    return [
+        intf[len("interface ") :].lstrip()
+        for intf, data_dict in output.items()
+        if intf.startswith("interface ")
+        and "mpls label protocol ldp" in data_dict
+    ]
 
 
-def get_mpls_ldp_session_count(device):
+def get_mpls_ldp_session_count(device, output=None):
     """ Get mpls ldp seesion count
 
         Args:
             device(`str`): Device str
+            output ('dict'): Optional. Parsed output of command
+                             'show mpls ldp neighbor'
         Returns:
             int: session count
         Raises:
@@ -76,61 +82,116 @@ def get_mpls_ldp_session_count(device):
     log.info("Getting LDP neighbor count")
     ldp_session_count = 0
 
-    try:
-        output_ldp = device.parse("show mpls ldp neighbor")
-    except SchemaEmptyParserError as e:
-        return ldp_session_count
+    if not output:
+        try:
+            output = device.parse("show mpls ldp neighbor")
+        except SchemaEmptyParserError as e:
+            return ldp_session_count
 
-    for vrf in output_ldp["vrf"]:
-        ldp_session_count += len(output_ldp["vrf"][vrf]["peers"].keys())
+    ldp_session_count = sum(
+        len(vrf_data.get("peers", ()))
+        for vrf_data in output.get("vrf", {}).values()
+    )
 
-    log.info("LDP neighbor count is {}".format(ldp_session_count))
+    log.info("LDP neighbor count is %d", ldp_session_count)
 
     return ldp_session_count
 
 
-def get_mpls_ldp_peer_state(device, interface):
+def _iter_ldp_discovery_sources(out):
+    """ Walk ldp discovery source interfaces of every peer in every vrf
+        Interface names are normalized with Common.convert_intf_name
+
+        Args:
+            out ('dict'): Parsed output of command 'show mpls ldp neighbor'
+        Returns:
+            generator of (interface, ldp peer state)
+    """
+    for vrf_data in out.get("vrf", {}).values():
+        for peer_data in vrf_data.get("peers", {}).values():
+            for lsi in peer_data.get("label_space_id", {}).values():
+                # Discovery sources are keyed by interface name
+                sources = lsi.get("ldp_discovery_sources", {}).get(
+                    "interface", {}
+                )
+                for intf in sources:
+                    yield _canon_intf(intf), lsi.get("state", None)
+
+
+def _build_ldp_interface_index(out):
+    """ Map each ldp discovery source interface to its peer state
+
+        Args:
+            out ('dict'): Parsed output of command 'show mpls ldp neighbor'
+        Returns:
+            ldp peer state per interface ('dict')
+    """
+    index = {}
+
+    # First peer found for an interface wins
+    for intf, state in _iter_ldp_discovery_sources(out):
+        index.setdefault(intf, state)
+
+    return index
+
+
+def get_mpls_ldp_peer_state(device, interface, output=None):
     """ Gets the ldp peer state under specified interface
+        For several interfaces, use get_mpls_ldp_peer_states which
+        runs 'show mpls ldp neighbor' only once
 
         Args:
             device ('obj'): device to run on
             interface ('str'): interface to search under
+            output ('dict'): Optional. Parsed output of command
+                             'show mpls ldp neighbor'
         Returns:
             ldp peer state ('str')
         Raises:
             None
     """
-    try:
-        out = device.parse("show mpls ldp neighbor")
-    except SchemaEmptyParserError:
-        return None
-
-    if out and "vrf" in out:
-        for vrf in out["vrf"]:
-            for peer in out["vrf"][vrf].get("peers", {}):
-                for index in out["vrf"][vrf]["peers"][peer].get(
-                    "label_space_id", {}
-                ):
-
-                    state = out["vrf"][vrf]["peers"][peer]["label_space_id"][
-                        index
-                    ].get("state", None)
-
-                    if "ldp_discovery_sources" in out["vrf"][vrf]["peers"][
-                        peer
-                    ]["label_space_id"][index] and interface in out["vrf"][
-                        vrf
-                    ][
-                        "peers"
-                    ][
-                        peer
-                    ][
-                        "label_space_id"
-                    ][
-                        index
-                    ][
-                        "ldp_discovery_sources"
-                    ].get(
-                        "interface", None
-                    ):
-                        return state
+    if not output:
+        try:
+            output = device.parse("show mpls ldp neighbor")
+        except SchemaEmptyParserError:
+            return None
+
+    target = _canon_intf(interface)
+
+    # First peer found for an interface wins
+    return next(
+        (
+            state
+            for intf, state in _iter_ldp_discovery_sources(output)
+            if intf == target
+        ),
+        None,
+    )
+
+
+def get_mpls_ldp_peer_states(device, interfaces, output=None):
+    """ Gets the ldp peer state under each of the specified interfaces
+
+        Args:
+            device ('obj'): device to run on
+            interfaces ('list'): interfaces to search under
+            output ('dict'): Optional. Parsed output of command
+                             'show mpls ldp neighbor'
+        Returns:
+            ldp peer state per interface ('dict')
+                ex: {'GigabitEthernet1': 'Oper', 'GigabitEthernet2': None}
+        Raises:
+            None
+    """
+    if not output:
+        try:
+            output = device.parse("show mpls ldp neighbor")
+        except SchemaEmptyParserError:
+            return {interface: None for interface in interfaces}
+
+    index = _build_ldp_interface_index(output)
+
+    return {
+        interface: index.get(_canon_intf(interface))
+        for interface in interfaces
+    }
@@ -0,0 +1,121 @@
+# Python
+import unittest
+from unittest.mock import Mock
+
+# Genie
+from genie.metaparser.util.exceptions import SchemaEmptyParserError
+from genie.libs.sdk.apis.iosxe.mpls.get import (
+    get_mpls_ldp_peer_state,
+    get_mpls_ldp_peer_states,
+)
+
+# Parsed 'show mpls ldp neighbor'
+ldp_neighbor = {
+    'vrf': {
+        'default': {
+            'peers': {
+                '10.169.197.252': {
+                    'label_space_id': {
+                        0: {
+                            'state': 'Oper',
+                            'ldp_discovery_sources': {
+                                'interface': {
+                                    'GigabitEthernet0/0/0': {
+                                        'ip_address': {'10.169.197.254': {}}
+                                    }
+                                }
+                            }
+                        }
+                    }
+                },
+                '10.169.197.253': {
+                    'label_space_id': {
+                        0: {
+                            'state': 'Down',
+                            'ldp_discovery_sources': {
+                                'targeted_hello': {}
+                            }
+                        }
+                    }
+                },
+                '10.169.197.251': {
+                    'label_space_id': {
+                        0: {
+                            'state': 'Down',
+                            'ldp_discovery_sources': {
+                                'interface': {
+                                    'GigabitEthernet0/0/0': {}
+                                }
+                            }
+                        }
+                    }
+                },
+            }
+        }
+    }
+}
+
+
+class test_get_mpls_ldp_peer_state(unittest.TestCase):
+
+    def setUp(self):
+        self.device = Mock()
+        self.device.parse = Mock(return_value=ldp_neighbor)
+
+    def test_full_name(self):
+        self.assertEqual(
+            get_mpls_ldp_peer_state(self.device, 'GigabitEthernet0/0/0'),
+            'Oper')
+
+    def test_abbreviated_name(self):
+        self.assertEqual(
+            get_mpls_ldp_peer_state(self.device, 'Gi0/0/0'), 'Oper')
+
+    def test_unknown_interface(self):
+        self.assertIsNone(
+            get_mpls_ldp_peer_state(self.device, 'GigabitEthernet0/0/1'))
+
+    def test_output_skips_parse(self):
+        self.assertEqual(
+            get_mpls_ldp_peer_state(
+                self.device, 'Gi0/0/0', output=ldp_neighbor),
+            'Oper')
+        self.device.parse.assert_not_called()
+
+    def test_empty_output(self):
+        self.device.parse.side_effect = SchemaEmptyParserError('empty')
+        self.assertIsNone(get_mpls_ldp_peer_state(self.device, 'Gi0/0/0'))
+
+
+class test_get_mpls_ldp_peer_states(unittest.TestCase):
+
+    interfaces = ['GigabitEthernet0/0/0', 'Gi0/0/0', 'GigabitEthernet0/0/1']
+
+    def setUp(self):
+        self.device = Mock()
+        self.device.parse = Mock(return_value=ldp_neighbor)
+
+    def test_single_parse(self):
+        get_mpls_ldp_peer_states(self.device, self.interfaces)
+        self.device.parse.assert_called_once_with('show mpls ldp neighbor')
+
+    def test_agrees_with_single_lookup(self):
+        states = get_mpls_ldp_peer_states(self.device, self.interfaces)
+        self.assertEqual(
+            states,
+            {intf: get_mpls_ldp_peer_state(self.device, intf)
+             for intf in self.interfaces})
+        self.assertEqual(states, {
+            'GigabitEthernet0/0/0': 'Oper',
+            'Gi0/0/0': 'Oper',
+            'GigabitEthernet0/0/1': None})
+
+    def test_empty_output(self):
+        self.device.parse.side_effect = SchemaEmptyParserError('empty')
+        self.assertEqual(
+            get_mpls_ldp_peer_states(self.device, self.interfaces),
+            dict.fromkeys(self.interfaces))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@
 # Python
 import logging
 import re
+import functools
 import jinja2
 import shlex, subprocess
 import time
@@ -343,6 +344,18 @@ def has_configuration(configuration_dict, configuration):
     return False
 
 
+# Interface name normalization is pure, so results are shared between calls
+@functools.lru_cache(maxsize=512)
+def _canon_intf(interface):
+    """ Convert interface name to its full name, cached per name
+        Args:
+            interface ('str'): interface name, i.e. Gi1
+        Returns:
+            full interface name, i.e. GigabitEthernet1
+    """
+    return Common.convert_intf_name(interface)
+
+
 def int_to_mask(mask_int):
     """ Convert int to mask
         Args: